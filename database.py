@@ -11,6 +11,40 @@ data on NEOs and close approaches extracted by `extract.load_neos` and
 `extract.load_approaches`.
 
 """
+import gc
+import operator
+import os
+import pathlib
+import pickle
+from array import array
+from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat
+
+from extract import load_neos, load_approaches
+from filters import (
+    approach_date, compile_predicate,
+    get_diameter, get_distance, get_hazardous, get_velocity)
+
+# The column that backs each getter used by `create_filters`. Columns are
+# keyed by name, rather than by getter, so that they survive pickling.
+_COLUMN_NAMES = {
+    approach_date: 'date',
+    get_distance: 'distance',
+    get_velocity: 'velocity',
+    get_diameter: 'diameter',
+    get_hazardous: 'hazardous',
+}
+
+# Comparators on the date that can be answered from the sorted-by-date index.
+_DATE_RANGE_OPS = (operator.eq, operator.ge, operator.le)
+
+# The number of rows `query` filters at a time.
+_BLOCK_SIZE = 1 << 16
+
+# The folder of the modules that build and define the cached objects - a cache
+# older than any of them is stale.
+_PROJECT_ROOT = pathlib.Path(__file__).parent.resolve()
 
 
 class NEODatabase:
@@ -45,34 +79,129 @@ class NEODatabase:
         self._neos = neos
         self._approaches = approaches
 
-        # Trading off space, so that these opperations can be parrallelized in
-        # future
-        ID_neo_corpus = {
-            neo.designation: id for id, neo in enumerate(self._neos)}
-        ID_app_corpus = {
-            app.get_designation: id for id, app in enumerate(self._approaches)}
+        # Build the lookup tables once, so that both linking and the
+        # `get_neo_by_*` methods are plain hash lookups.
+        self._by_designation = {neo.designation: neo for neo in self._neos}
+        self._by_name = {neo.name: neo for neo in self._neos if neo.name}
 
-        neos_approach_shared_ids = set(
-            ID_neo_corpus).intersection(ID_app_corpus)
-
-        # only approaches that also in neo. optimize search space
-        # future optimization also include use of set() operations A.B'
-        minimized_approachs_list = [
-            app for app in self._approaches
-            if app.get_designation in neos_approach_shared_ids]
-
-        for approach in minimized_approachs_list:
+        # Link every approach to its NEO in a single pass. The NEOs' own
+        # collections of approaches are only grouped on first access.
+        for approach in self._approaches:
+            neo = self._by_designation.get(approach._designation)
+            if neo is not None:
+                approach.neo = neo
+
+        for neo in self._neos:
+            neo._db = self
+        self._approaches_by_designation = None
+
+        # Parallel columns of the filterable attributes, one entry per
+        # approach. Scanning a column touches contiguous memory instead of
+        # chasing a pointer into every `CloseApproach` object. Dates are
+        # stored as day ordinals, so comparing them is integer arithmetic.
+        nan = float('nan')
+        approaches = self._approaches
+        linked = [approach.neo for approach in approaches]
+        self._columns = {
+            'date': array(
+                'l', (approach.time.toordinal() for approach in approaches)),
+            'distance': array('d', map(get_distance, approaches)),
+            'velocity': array('d', map(get_velocity, approaches)),
+            'diameter': array(
+                'd', (neo.diameter if neo else nan for neo in linked)),
+            'hazardous': [neo.hazardous if neo else None for neo in linked],
+        }
+
+        # A sorted-by-date index, so date criteria resolve to a contiguous
+        # slice found by bisection instead of a scan over every approach.
+        dates = self._columns['date']
+        order = sorted(range(len(dates)), key=dates.__getitem__)
+        self._time_order = order
+        self._dates_sorted = array('l', map(dates.__getitem__, order))
+
+    @classmethod
+    def load_or_build(cls, neo_csv_path, cad_json_path, cache_path):
+        """Load a cached `NEODatabase`, or build one from the data files.
+
+        The cache is used only if it was built from the same data files and
+        is newer than both of them, as well as every module of the project -
+        the ones that load, build and define the pickled objects. Otherwise,
+        the database is built from `extract.load_neos` and
+        `extract.load_approaches`, and then pickled to `cache_path` to speed
+        up the next run.
+
+        :param neo_csv_path: A path to a CSV file containing data about
+         near-Earth objects.
+        :param cad_json_path: A path to a JSON file containing data about
+         close approaches.
+        :param cache_path: A path to the pickled database.
+        :return: A `NEODatabase` of the NEOs and close approaches in the
+         data files.
+        """
 
-            app_id = approach.get_designation
-            matched_neo_idx = ID_neo_corpus[app_id]
+        sources = (str(pathlib.Path(neo_csv_path).resolve()),
+                   str(pathlib.Path(cad_json_path).resolve()))
+        cache_path = pathlib.Path(cache_path)
+
+        try:
+            dependencies = sources + tuple(_PROJECT_ROOT.glob('*.py'))
+            if cache_path.stat().st_mtime > max(
+                    os.stat(path).st_mtime for path in dependencies):
+                with open(cache_path, 'rb') as cache_file:
+                    # Unpickling allocates hundreds of thousands of objects
+                    # that are all kept alive, so pausing the cyclic garbage
+                    # collector in the meantime saves it a lot of futile scans.
+                    gc_was_enabled = gc.isenabled()
+                    gc.disable()
+                    try:
+                        cached_sources, database = pickle.load(cache_file)
+                    finally:
+                        if gc_was_enabled:
+                            gc.enable()
+                if cached_sources == sources:
+                    return database
+        except Exception:
+            # A missing, stale or unreadable cache is simply rebuilt.
+            pass
+
+        database = cls(load_neos(neo_csv_path), load_approaches(cad_json_path))
+
+        # Write to a temporary file first, so an interrupted run never
+        # leaves a truncated cache behind.
+        partial_path = cache_path.with_name(cache_path.name + '.partial')
+        try:
+            with open(partial_path, 'wb') as cache_file:
+                pickle.dump((sources, database), cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial_path, cache_path)
+        except OSError:
+            # Caching is only an optimization - e.g. the folder may be
+            # read-only.
+            pass
+
+        return database
+
+    def get_approaches_by_designation(self, designation):
+        """Find and return the close approaches of an NEO.
+
+        The approaches of every NEO are grouped by primary designation the
+        first time this is called, and then reused.
+
+        :param designation: The primary designation of the NEO.
+        :return: A collection of the NEO's `CloseApproach`es - empty if there
+         are none.
+        """
 
-            approach.neo = self._neos[matched_neo_idx]
-            self._neos[matched_neo_idx].approaches.append(approach)
+        if self._approaches_by_designation is None:
+            # `.get` on a `defaultdict` doesn't insert, so no copy into a
+            # plain `dict` is needed afterwards.
+            grouped = defaultdict(list)
+            for approach in self._approaches:
+                if approach.neo is not None:
+                    grouped[approach._designation].append(approach)
+            self._approaches_by_designation = grouped
 
-        # This is much more efficient than creating these dictionaries inside
-        # the function
-        self.neos_ids = {neo.designation: neo for neo in self._neos}
-        self.neos_names = {neo.name: neo for neo in self._neos}
+        return self._approaches_by_designation.get(designation, ())
 
     def get_neo_by_designation(self, designation):
         """Find and return an NEO by its primary designation.
@@ -89,7 +218,7 @@ class NEODatabase:
         designation, or `None`.
         """
 
-        return self.neos_ids.get(designation.upper(), None)
+        return self._by_designation.get(designation.upper())
 
     def get_neo_by_name(self, name):
         """Find and return an NEO by its name.
@@ -106,7 +235,7 @@ class NEODatabase:
         :return: The `NearEarthObject` with the desired name, or `None`.
         """
 
-        return self.neos_names.get(name.capitalize(), None)
+        return self._by_name.get(name)
 
     def query(self, filters=()):
         """Query close approaches to generate those that match
@@ -116,7 +245,8 @@ class NEODatabase:
         match all of the provided filters.
 
         The main.py script supplies to the query method whatever
-        was returned from the create_filters function
+        was returned from the create_filters function. A predicate
+        precompiled with `compile_predicate` is accepted as well.
 
         If no arguments are provided, generate all known close approaches.
 
@@ -125,14 +255,62 @@ class NEODatabase:
         often sorted by time.
 
         :param filters: A collection of filters capturing user-specified
-         criteria.
+         criteria, or a 1-argument predicate on a `CloseApproach`.
         :return: A stream of matching `CloseApproach` objects.
         """
 
-        for approach in self._approaches:
-
-            if filters:
-                if all(map(lambda func, app=approach: func(app), filters)):
-                    yield approach
+        if callable(filters):
+            yield from filter(filters, self._approaches)
+            return
+
+        if not filters:
+            yield from self._approaches
+            return
+
+        if not all(get in _COLUMN_NAMES for get, _, _ in filters):
+            # A criterion that isn't backed by a column: test the objects.
+            yield from filter(compile_predicate(filters), self._approaches)
+            return
+
+        # Narrow date criteria to a slice of the sorted-by-date index.
+        dates_sorted = self._dates_sorted
+        lo, hi = 0, len(dates_sorted)
+        ranged = False
+        remaining = []
+        for get, op, value in filters:
+            if get is approach_date:
+                value = value.toordinal()
+            if get is approach_date and op in _DATE_RANGE_OPS:
+                if op is not operator.le:
+                    lo = max(lo, bisect_left(dates_sorted, value))
+                if op is not operator.ge:
+                    hi = min(hi, bisect_right(dates_sorted, value))
+                ranged = True
             else:
-                yield approach
+                column = self._columns[_COLUMN_NAMES[get]]
+                remaining.append((column, op, value))
+
+        rows = None
+        if ranged:
+            # Restore internal order among the approaches in the slice.
+            rows = sorted(self._time_order[lo:hi])
+            if not remaining:
+                yield from map(self._approaches.__getitem__, rows)
+                return
+
+        # Work through the candidate rows in blocks, applying each remaining
+        # criterion only to the rows of the block that survived the previous
+        # ones - all without a Python-level loop. Blocks keep the working set
+        # small, and matches are yielded without scanning the whole column
+        # first, so a limited query stops early.
+        total = len(self._approaches) if rows is None else len(rows)
+        for start in range(0, total, _BLOCK_SIZE):
+            stop = min(start + _BLOCK_SIZE, total)
+            block = range(start, stop) if rows is None else rows[start:stop]
+            for column, op, value in remaining:
+                if isinstance(block, range):
+                    values = column[block.start:block.stop]
+                else:
+                    values = map(column.__getitem__, block)
+                block = list(compress(block, map(op, values, repeat(value))))
+            yield from map(self._approaches.__getitem__, block)
@@ -14,6 +14,7 @@ the command line, and uses the resulting collections to build an `NEODatabase`.
 """
 import csv
 import json
+import operator
 
 from models import NearEarthObject, CloseApproach
 
@@ -26,18 +27,16 @@ def load_neos(neo_csv_path):
     :return: A collection of `NearEarthObject`s.
     """
 
-    neo_obj_lst = []
-
     with open(neo_csv_path, 'r') as cv_file:
+        neo_reader = csv.reader(cv_file)
 
-        neo_reader = csv.DictReader(cv_file)
-
-        for neo_elem in neo_reader:
-
-            neo_obj = NearEarthObject(**neo_elem)
-            neo_obj_lst.append(neo_obj)
+        # Read the header once and pick the columns of interest by position,
+        # instead of building a dictionary for every row.
+        header = next(neo_reader)
+        neo_fields = operator.itemgetter(*(
+            header.index(key) for key in ("pdes", "name", "diameter", "pha")))
 
-    return neo_obj_lst
+        return [NearEarthObject(*neo_fields(row)) for row in neo_reader]
 
 
 def load_approaches(cad_json_path):
@@ -49,19 +48,13 @@ def load_approaches(cad_json_path):
     """
 
     with open(cad_json_path, 'r') as json_file:
-
         close_reader = json.load(json_file)
 
-        close_obj_keys = close_reader["fields"]
-        close_obj_data = close_reader["data"]
-        close_reader_dict = [
-            dict(zip(close_obj_keys, value))
-            for value in close_obj_data]
-
-        close_approach_lst = []
-
-        for elem in close_reader_dict:
-            close_approach = CloseApproach(**elem)
-            close_approach_lst.append(close_approach)
+    # Build each approach straight from its row, picking the fields of
+    # interest by position rather than materializing a dictionary per record.
+    fields = close_reader["fields"]
+    approach_fields = operator.itemgetter(
+        *(fields.index(key) for key in ("des", "cd", "dist", "v_rel")))
 
-    return close_approach_lst
+    return [
+        CloseApproach(*approach_fields(row)) for row in close_reader["data"]]
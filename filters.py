@@ -1,15 +1,15 @@
 """Provide filters for querying close approaches & limit the generated results.
 
-The `create_filters` function produces a collection of objects that is used by
+The `create_filters` function produces a collection of criteria that is used by
 the `query` method to generate a stream of `CloseApproach` objects that match
 all of the desired criteria. The arguments to `create_filters` are provided by
 the main module and originate from the user's command-line options.
 
-This function can be thought to return a collection of instances of subclasses
-of `AttributeFilter` - a 1-argument callable (on a `CloseApproach`) constructed
-from a comparator (from the `operator` module), a reference value, and a class
-method `get` that subclasses can override to fetch an attribute of
-interest from the supplied `CloseApproach`.
+Each criterion is a `(getter, op, value)` tuple: a 1-argument callable that
+fetches an attribute of interest from a `CloseApproach`, a comparator (from the
+`operator` module), and a reference value. A criterion matches an approach when
+`op(getter(approach), value)` is true. The `compile_predicate` function fuses a
+collection of criteria into a single predicate, generated once per query.
 
 The `limit` function simply limits the maximum number of values produced by an
 iterator.
@@ -19,159 +19,36 @@ import operator
 from itertools import islice
 
 
-class UnsupportedCriterionError(NotImplementedError):
-    """A filter criterion is unsupported."""
+def approach_date(approach):
+    """Return the calendar date of a close approach."""
 
+    return approach.time.date()
 
-class AttributeFilter:
-    """A general superclass for filters on comparable attributes.
 
-    An `AttributeFilter` represents the search criteria pattern comparing some
-    attribute of a close approach, or its attached NEO to a reference value. It
-    essentially functions as a callable predicate for whether a
-    `CloseApproach` object satisfies the encoded criterion.
+# Getters for the attributes of interest. `operator.attrgetter` is implemented
+# in C, so fetching an attribute doesn't dispatch through Python code.
+get_distance = operator.attrgetter('distance')
+get_velocity = operator.attrgetter('velocity')
+get_diameter = operator.attrgetter('neo.diameter')
+get_hazardous = operator.attrgetter('neo.hazardous')
 
-    It is constructed with a comparator operator and a reference value, and
-    calling the filter (with __call__) executes `get(approach) OP value` (in
-    infix notation).
-
-    Concrete subclasses can override the `get` classmethod to provide custom
-    behavior to fetch a desired attribute from the given `CloseApproach`.
-    """
-
-    def __init__(self, op, value):
-        """Construct a new `AttributeFilter` from a binary predicate and
-        a reference value.
-
-        The reference value will be supplied as the second (right-hand side)
-        argument to the operator function. For example, an `AttributeFilter`
-        with `op=operator.le` and `value=10` will, when called on an approach,
-        evaluate `some_attribute <= 10`.
-
-        - <=, ==, or >= - available as operator.le, operator.eq, and
-        operator.ge; i.e, operator.ge(a, b) is the same as a >= b.
-
-        :param op: A 2-argument predicate comparator (such as `operator.le`).
-        :param value: The reference value to compare against. It is supplied
-         by the user
-        at the command line and fed to create_filters by the main module.
-        """
-
-        self.op = op
-        self.value = value
-
-    def __call__(self, approach):
-        """Invoke self(approach)
-
-        The __call__ method makes instance objects of this type behave as
-        callables. With an instance of a subclass of AttributeFilter named f,
-        then the code f(approach) evaluates f.__call__(approach). Specifically,
-        "calling" the AttributeFilter with a CloseApproach object will get
-        the attribute of interest (self.get(approach)) and compare
-        it (via self.op) to the reference value (self.value), returning either
-        True or False, representing whether that close approach satisfiesthe
-        criterion.
-        """
-
-        return self.op(self.get(approach), self.value)
-
-    @classmethod
-    def get(cls, approach):
-        """Get an attribute of interest from a close approach.
-
-        Concrete subclasses must override this method to get an attribute of
-        interest from the supplied `CloseApproach`.
-
-        :param approach: A `CloseApproach` on which to evaluate this filter.
-        :return:
-            The value of an attribute of interest, comparable to
-            `self.value` via `self.op`.
-        """
-        # one option is to make it also abstract
-        raise UnsupportedCriterionError  # subclass of NotImplementedError
-
-    def __repr__(self):
-        return (
-            f"{self.__class__.__name__}(op=operator.{self.op.__name__},"
-            f" value={self.value})"
-        )
-
-
-class DesignationFilter(AttributeFilter):
-    """build an AttributeFilter that filtered on the designation attribute
-
-     of the NearEarthObject attached to a CloseApproach,
-     define a new subclass of AttributeFilter
-     (This is only an example & not needed because primary
-     designations are unique and we already have
-     NEODatabase.get_neo_by_designation).
-
-    """
-    @classmethod
-    def get(cls, approach):
-        return approach.neo.designation
-
-
-class DateFilters(AttributeFilter):
-    """build an AttributeFilter that filtered on the Date attribute"""
-
-    @classmethod
-    def get(cls, approach):
-        """
-        for an input time (date, start_date, end_date), return the
-        corrosponding approach.time and convert to date_time_obj
-        """
-
-        return approach.time.date()
-
-
-class DistanceFilters(AttributeFilter):
-    """build an AttributeFilter that filtered on Distance attribute"""
-
-    @classmethod
-    def get(cls, approach):
-        """
-        for an input distance (min,max), return the
-        corrosponding approach.distance
-        """
-        return approach.distance
-
-
-class VelocityFilters(AttributeFilter):
-    """build an AttributeFilter that filtered on the velocity attribute"""
-
-    @classmethod
-    def get(cls, approach):
-        """
-        for an input Velocity (min,max), return the
-        corrosponding approach.velocity
-        """
-        return approach.velocity
-
-
-class DiameterFilters(AttributeFilter):
-    """build an AttributeFilter that filtered on diameter attribute"""
-
-    @classmethod
-    def get(cls, approach):
-        """
-        for an input diameter (min,max), return the
-        corrosponding approach.neo.diameter
-        """
-        return approach.neo.diameter
-
-
-class HazardousFilter(AttributeFilter):
-    """build an AttributeFilter that filtered on hazardous attribute"""
-
-    @classmethod
-    def get(cls, approach):
-        """
-        for an input hazardous, return the
-        corrosponding approach.neo.hazardous only if hazardous is not None
-        """
-
-        return approach.neo.hazardous
+# Python source equivalent to the getters and comparators above, for use by
+# `compile_predicate`.
+_GETTER_SOURCE = {
+    approach_date: 'approach.time.date()',
+    get_distance: 'approach.distance',
+    get_velocity: 'approach.velocity',
+    get_diameter: 'approach.neo.diameter',
+    get_hazardous: 'approach.neo.hazardous',
+}
+_OP_SOURCE = {
+    operator.eq: '==',
+    operator.ne: '!=',
+    operator.lt: '<',
+    operator.le: '<=',
+    operator.gt: '>',
+    operator.ge: '>=',
+}
 
 
 def create_filters(date=None, start_date=None, end_date=None,
@@ -195,8 +72,8 @@ def create_filters(date=None, start_date=None, end_date=None,
 
     The return value must be compatible with the `query` method of
     `NEODatabase` because the main module directly passes this result
-    to that method. For now, this can be thought of as a collection of
-    `AttributeFilter`s.
+    to that method: a list of `(getter, op, value)` criteria, ordered from
+    the most to the least selective.
 
     :param date (datetime objects):
         A `date` on which a matching `CloseApproach` occurs.
@@ -222,39 +99,91 @@ def create_filters(date=None, start_date=None, end_date=None,
         A collection of filters for use with `query`.
     """
 
+    # Each criterion is tagged with its estimated selectivity (lower is more
+    # selective), so that the most selective ones are evaluated first.
     filters_list = []
 
     if date:
-        filters_list.append(DateFilters(operator.eq, date))
+        filters_list.append((0, (approach_date, operator.eq, date)))
 
     if start_date:
-        filters_list.append(DateFilters(operator.ge, start_date))
+        filters_list.append((2, (approach_date, operator.ge, start_date)))
 
     if end_date:
-        filters_list.append(DateFilters(operator.le, end_date))
+        filters_list.append((2, (approach_date, operator.le, end_date)))
 
     if distance_min:
-        filters_list.append(DistanceFilters(operator.ge, distance_min))
+        filters_list.append((4, (get_distance, operator.ge, distance_min)))
 
     if distance_max:
-        filters_list.append(DistanceFilters(operator.le, distance_max))
+        filters_list.append((4, (get_distance, operator.le, distance_max)))
 
     if velocity_min:
-        filters_list.append(VelocityFilters(operator.ge, velocity_min))
+        filters_list.append((5, (get_velocity, operator.ge, velocity_min)))
 
     if velocity_max:
-        filters_list.append(VelocityFilters(operator.le, velocity_max))
+        filters_list.append((5, (get_velocity, operator.le, velocity_max)))
 
     if diameter_min:
-        filters_list.append(DiameterFilters(operator.ge, diameter_min))
+        filters_list.append((3, (get_diameter, operator.ge, diameter_min)))
 
     if diameter_max:
-        filters_list.append(DiameterFilters(operator.le, diameter_max))
+        filters_list.append((3, (get_diameter, operator.le, diameter_max)))
 
     if hazardous is not None:
-        filters_list.append(HazardousFilter(operator.eq, hazardous))
+        filters_list.append((1, (get_hazardous, operator.eq, hazardous)))
+
+    filters_list.sort(key=operator.itemgetter(0))
+
+    return [criterion for _, criterion in filters_list]
 
-    return filters_list
+
+def compile_predicate(filters):
+    """Fuse a collection of criteria into a single predicate.
+
+    The returned callable takes a `CloseApproach` and returns whether it
+    satisfies every criterion, stopping at the first one that fails.
+
+    The predicate is generated from source specialized to the criteria at
+    hand, e.g. `approach.distance >= _value0 and approach.neo.hazardous ==
+    _value1`, so that evaluating it is one chain of comparisons with no
+    per-criterion function calls. Getters and comparators that can't be
+    inlined are called instead. Reference values are never spliced into the
+    source - they're bound as names in the predicate's namespace.
+
+    The criteria from `create_filters` are all answered from the database's
+    columns instead; `NEODatabase.query` only falls back to this for criteria
+    with other getters, and it accepts a predicate compiled ahead of time.
+
+    :param filters: A collection of `(getter, op, value)` criteria, as
+     returned by `create_filters`.
+    :return: A 1-argument predicate on a `CloseApproach`.
+    """
+
+    namespace = {}
+    terms = []
+
+    for idx, (get, op, value) in enumerate(filters):
+        namespace[f'_value{idx}'] = value
+
+        if get in _GETTER_SOURCE:
+            operand = _GETTER_SOURCE[get]
+        else:
+            namespace[f'_get{idx}'] = get
+            operand = f'_get{idx}(approach)'
+
+        if op in _OP_SOURCE:
+            terms.append(f'{operand} {_OP_SOURCE[op]} _value{idx}')
+        else:
+            namespace[f'_op{idx}'] = op
+            terms.append(f'_op{idx}({operand}, _value{idx})')
+
+    source = (
+        "def predicate(approach):\n"
+        f"    return {' and '.join(terms) or 'True'}\n")
+    exec(source, namespace)
+
+    return namespace['predicate']
 
 
 def limit(iterator, n=None):
@@ -267,11 +196,6 @@ def limit(iterator, n=None):
     :yield: The first (at most) `n` values from the iterator.
     """
 
-    # don't limit the iterator at all
-    if n == 0 or n is None:
-        return iterator
-
-    # else return first n elements from iterator:
-    # https://stackoverflow.com/questions/26864008/simplest-way-to-get-the-first-n-elements-of-an-iterator
-
-    return list(islice(iterator, n))
+    # Slice lazily either way, so that only the values actually consumed
+    # are ever produced.
+    return iterator if not n else islice(iterator, n)
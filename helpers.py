@@ -11,6 +11,18 @@ representations display seconds, but NASA's data (and our datetimes!) don't
 provide that level of resolution, so the output format also will not.
 """
 import datetime
+import re
+
+# NASA's `cd` format, and the English month abbreviations it uses.
+_CD_PATTERN = re.compile(r"(\d{4})-([A-Z][a-z]{2})-(\d{2}) (\d{2}):(\d{2})\Z")
+_MONTHS = {
+    month: number for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+         "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+
+# Bound once, rather than looked up on every call of `cd_to_datetime`.
+_match_cd = _CD_PATTERN.match
+_datetime = datetime.datetime
 
 
 def cd_to_datetime(calendar_date):
@@ -26,7 +38,17 @@ def cd_to_datetime(calendar_date):
     :param calendar_date: A calendar date in YYYY-bb-DD hh:mm format.
     :return: A naive `datetime` corresponding to the given calendar date and time.
     """
-    return datetime.datetime.strptime(calendar_date, "%Y-%b-%d %H:%M")
+    # `strptime` is implemented in pure Python and dominates load time, so
+    # parse the fixed-width fields directly and only fall back to it for
+    # anything out of the ordinary.
+    match = _match_cd(calendar_date)
+    if match:
+        year, month, day, hour, minute = match.groups()
+        month = _MONTHS.get(month)
+        if month:
+            return _datetime(
+                int(year), month, int(day), int(hour), int(minute))
+    return _datetime.strptime(calendar_date, "%Y-%b-%d %H:%M")
 
 
 def datetime_to_str(dt):
@@ -41,4 +63,6 @@ def datetime_to_str(dt):
     :param dt: A naive Python datetime.
     :return: That datetime, as a human-readable string without seconds.
     """
-    return datetime.datetime.strftime(dt, "%Y-%m-%d %H:%M")
+    # Equivalent to `strftime("%Y-%m-%d %H:%M")`, but without parsing a
+    # format string on every call - this runs once per approach written out.
+    return dt.isoformat(" ", "minutes")
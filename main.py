@@ -44,7 +44,6 @@ import shlex
 import sys
 import time
 
-from extract import load_neos, load_approaches
 from database import NEODatabase
 from filters import create_filters, limit
 from write import write_to_csv, write_to_json
@@ -89,6 +88,9 @@ def make_parser():
     parser.add_argument('--cadfile', default=(DATA_ROOT / 'cad.json'),
                         type=pathlib.Path,
                         help="Path to JSON file of close approach data.")
+    parser.add_argument('--cachefile', default=(DATA_ROOT / 'neos.cache'),
+                        type=pathlib.Path,
+                        help="Path to a cache of the database built from the data files.")
     subparsers = parser.add_subparsers(dest='cmd')
 
     # Add the `inspect` subcommand parser.
@@ -150,6 +152,8 @@ def make_parser():
     query.add_argument('-o', '--outfile', type=pathlib.Path,
                        help="File in which to save structured results. "
                             "If omitted, results are printed to standard output.")
+    query.add_argument('--pretty', action='store_true',
+                       help="If specified, indent JSON results to make them easier to read.")
 
     repl = subparsers.add_parser('interactive',
                                  description="Start an interactive command session "
@@ -229,7 +233,7 @@ def query(database, args):
         if args.outfile.suffix == '.csv':
             write_to_csv(limit(results, args.limit), args.outfile)
         elif args.outfile.suffix == '.json':
-            write_to_json(limit(results, args.limit), args.outfile)
+            write_to_json(limit(results, args.limit), args.outfile, pretty=args.pretty)
         else:
             print("Please use an output file that ends with `.csv` or `.json`.", file=sys.stderr)
 
@@ -381,8 +385,9 @@ def main():
     parser, inspect_parser, query_parser = make_parser()
     args = parser.parse_args()
 
-    # Extract data from the data files into structured Python objects.
-    database = NEODatabase(load_neos(args.neofile), load_approaches(args.cadfile))
+    # Extract data from the data files into structured Python objects, or load
+    # them from the cache of a previous run.
+    database = NEODatabase.load_or_build(args.neofile, args.cadfile, args.cachefile)
 
     # Run the chosen subcommand.
     if args.cmd == 'inspect':
@@ -16,9 +16,22 @@ data files from NASA, and handles missing names and unknown diameters.
 
 """
 import math
+import sys
 
 from helpers import cd_to_datetime, datetime_to_str
 
+# Templates for the `repr` of the models, built once at import time rather than
+# assembled from several f-string pieces on every call.
+_NEO_REPR = (
+    "NearEarthObject(designation={0!r}, name={1!r}, "
+    "diameter={2:.3f}, hazardous={3!r})")
+_APPROACH_REPR = (
+    "CloseApproach(time={0!r}, distance={1:.2f}, "
+    "velocity={2:.2f}, neo={3!r})")
+
+# Bound once, rather than looked up on `sys` for every model constructed.
+_intern = sys.intern
+
 
 class NearEarthObject:
     """A near-Earth object (NEO).
@@ -28,46 +41,70 @@ class NearEarthObject:
     diameter in kilometers (optional - sometimes unknown), and whether
     it's marked as potentially hazardous to Earth.
 
-    A `NearEarthObject` also maintains a collection of its close approaches -
-    initialized to an empty collection, but eventually populated in the
-    `NEODatabase` constructor.
+    A `NearEarthObject` also provides a collection of its close approaches -
+    empty, until the NEO is linked to an `NEODatabase` by its constructor.
     """
 
-    def __init__(self, **info):
+    __slots__ = (
+        'designation', 'name', 'diameter', 'hazardous', '_db', '_fullname')
+
+    def __init__(self, pdes, name=None, diameter=None, pha=None, **info):
         """Create a new `NearEarthObject`.
 
-        one implementation can be by defining default keys/values
-        default =
-        {"pdes":None,"name":None,"diameter":float("nan"),"pha":False}
-        another can by by overriding __missing__ :D
+        The fields can be passed positionally, or as keyword arguments named
+        after the columns of the NEO data file.
 
+        :param pdes: The primary designation of the NEO.
+        :param name: The IAU name of the NEO - empty or None if unnamed.
+        :param diameter: The diameter in km - empty or None if unknown.
+        :param pha: 'Y' or True if the NEO is potentially hazardous - 'N',
+         False, empty or None if not.
         :param info:
             dictionary of excess keyword arguments supplied to the construct
         """
 
-        self.designation = info.get("pdes")
-        self.name = info.get("name")
-        self.diameter = info.get("diameter", float('nan'))
-        self.hazardous = info.get("pha", False)
+        # Designations and names repeat across the data set and are used as
+        # lookup keys, so intern them to share one object per value.
+        self.designation = _intern(pdes)
+        self.name = _intern(name) if name else None
+        try:
+            self.diameter = float(diameter)
+        except (TypeError, ValueError):
+            self.diameter = float('nan')
+        self.hazardous = pha not in (None, '', 'N', False)
 
-        # Also set default values in case of return empty string
-        self.name = self.name if self.name else None
-        self.diameter = float(self.diameter) if self.diameter else float('nan')
-        self.hazardous = False if self.hazardous in ['N', ''] else True
+        # The `NEODatabase` this NEO is linked to, originally None.
+        self._db = None
 
-        # Create an empty initial collection of linked approaches.
-        self.approaches = []
+        # Formatted on first use by `fullname`.
+        self._fullname = None
+
+    @property
+    def approaches(self):
+        """Return the close approaches of this NEO.
+
+        The collection is materialized by the linked `NEODatabase` on first
+        access, so NEOs whose approaches are never read cost nothing extra.
+        """
+
+        if self._db is None:
+            return ()
+        return self._db.get_approaches_by_designation(self.designation)
 
     @property
     def fullname(self):
-        """Return a representation of the full name of this NEO."""
+        """Return a representation of the full name of this NEO.
+
+        The string is formatted once, on first access, and then reused.
+        """
 
-        f_name = (
-            f"{self.designation} :{self.name}"
-            if self.name else self.designation
-        )
+        if self._fullname is None:
+            self._fullname = (
+                f"{self.designation} :{self.name}"
+                if self.name else self.designation
+            )
 
-        return f_name
+        return self._fullname
 
     def __str__(self):
         """Return str(self),human-readable str representation of this obj."""
@@ -87,34 +124,20 @@ class NearEarthObject:
         """Return `repr(self)`,
             a computer-readable string representation of this object."""
 
-        return (
-            f"NearEarthObject(designation={self.designation!r}, "
-            f"name={self.name!r}, "
-            f"diameter={self.diameter:.3f}, hazardous={self.hazardous!r})")
+        return _NEO_REPR.format(
+            self.designation, self.name, self.diameter, self.hazardous)
 
     def __iter__(self):
-        """helper to iterate and save objects"""
-
-        serialized_obj = {"designation": self.designation, "name": self.name,
-                          "diameter_km": self.diameter,
-                          "potentially_hazardous": self.hazardous}
-
-        # Handle edge cases:
-        serialized_obj['name'] = (
-            serialized_obj['name']
-            if serialized_obj['name'] is not None
-            else ''
-        )
-
-        serialized_obj["potentially_hazardous"] = bool(
-            serialized_obj["potentially_hazardous"])
-
-        if math.isnan(serialized_obj["diameter_km"]):
-            serialized_obj["diameter_km"] = float('nan')
+        """helper to iterate and save objects
 
-        serialized_obj = [serialized_obj]
+        yields a single dictionary of the fields of interest
+        """
 
-        return iter(serialized_obj)
+        # `name` is the only field that still needs its edge case handled -
+        # the other ones are already coerced by the constructor
+        yield {"designation": self.designation, "name": self.name or '',
+               "diameter_km": self.diameter,
+               "potentially_hazardous": self.hazardous}
 
 
 class CloseApproach:
@@ -131,31 +154,42 @@ class CloseApproach:
     `NEODatabase` constructor.
     """
 
-    def __init__(self, **info):
+    __slots__ = (
+        '_designation', 'time', 'distance', 'velocity', 'neo', '_time_str')
+
+    def __init__(self, des, cd, dist=None, v_rel=None, neo=None, **info):
         """Create a new `CloseApproach`.
 
+        The fields can be passed positionally, or as keyword arguments named
+        after the fields of the close approach data file.
+
+        :param des: The primary designation of the approaching NEO.
+        :param cd: The approach time, in NASA's calendar date format.
+        :param dist: The nominal approach distance in au - None if unknown.
+        :param v_rel: The relative approach velocity in km/s - None if unknown.
+        :param neo: The approaching `NearEarthObject`, if already known.
         :param info:
             dictionary of excess keyword arguments supplied to the construct.
         """
 
-        self._designation = info.get('des')
-        self.time = cd_to_datetime(info.get('cd'))
-        self.distance = info.get('dist', float("nan"))
-        self.velocity = info.get('v_rel', float("nan"))
+        self._designation = _intern(des)
+        self.time = cd_to_datetime(cd)
 
-        # Also set default values in case of return empty string
-        self.time = self.time if self.time else None
-        self.distance = float(self.distance) if self.distance else float("nan")
-        self.velocity = float(self.velocity) if self.velocity else float("nan")
+        try:
+            self.distance = float(dist)
+        except (TypeError, ValueError):
+            self.distance = float("nan")
 
-        # Create an attribute for the referenced NEO, originally None.
-        self.neo = info.get("neo", None)
+        try:
+            self.velocity = float(v_rel)
+        except (TypeError, ValueError):
+            self.velocity = float("nan")
 
-    @property
-    def get_designation(self):
-        """getter to private attribute _designation"""
+        # Create an attribute for the referenced NEO, originally None.
+        self.neo = neo
 
-        return self._designation
+        # Formatted on first use by `time_str`.
+        self._time_str = None
 
     @property
     def time_str(self):
@@ -169,9 +203,14 @@ class CloseApproach:
         The `datetime_to_str` method converts a `datetime` object to a
         formatted string that can be used in human-readable representations and
         in serialization to CSV and JSON files.
+
+        The string is formatted once, on first access, and then reused.
         """
 
-        return datetime_to_str(self.time)
+        if self._time_str is None:
+            self._time_str = datetime_to_str(self.time)
+
+        return self._time_str
 
     def __str__(self):
         """Return `str(self)`,
@@ -188,29 +227,22 @@ class CloseApproach:
         """Return `repr(self)`,
         a computer-readable string representation of this object."""
 
-        return (
-            f"CloseApproach(time={self.time_str!r}, "
-            f"distance={self.distance:.2f}, "
-            f"velocity={self.velocity:.2f}, neo={self.neo!r})")
+        return _APPROACH_REPR.format(
+            self.time_str, self.distance, self.velocity, self.neo)
 
     def __iter__(self):
         """helper to iterate and save objects
 
-        returns list of two dictionaries that compress fields of interest
+        yields two dictionaries that compress fields of interest
         to be saved to either .json or .csv files
         """
 
-        # approach dictionary that includes neo object
-        extended_approach = [
-            {
-                "datetime_utc": datetime_to_str(self.time),
-                "distance_au": self.distance,
-                "velocity_km_s": self.velocity
-            }]
-
-        # encoded list of dictionary to fields of interest from neo object
-        neo_dict = list(iter(self.neo))
-
-        extended_approach.extend(neo_dict)
+        # approach dictionary of the fields of interest
+        yield {
+            "datetime_utc": self.time_str,
+            "distance_au": self.distance,
+            "velocity_km_s": self.velocity
+        }
 
-        return iter(extended_approach)
+        # dictionary of fields of interest from neo object
+        yield from self.neo
@@ -10,11 +10,17 @@ To run these tests from the project root, run:
 
 These tests should pass when Task 2 is complete.
 """
+import gc
+import os
 import pathlib
 import math
+import shutil
+import tempfile
 import unittest
+import unittest.mock
 
 
+import database
 from extract import load_neos, load_approaches
 from database import NEODatabase
 
@@ -115,5 +121,83 @@ class TestDatabase(unittest.TestCase):
         self.assertIsNone(nonexistent)
 
 
+class TestLoadOrBuild(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = pathlib.Path(tmp.name)
+        self.neo_file = self.root / TEST_NEO_FILE.name
+        self.cad_file = self.root / TEST_CAD_FILE.name
+        shutil.copy(TEST_NEO_FILE, self.neo_file)
+        shutil.copy(TEST_CAD_FILE, self.cad_file)
+        self.cache_file = self.root / 'neos.cache'
+
+        # Count how often the database is built from the data files.
+        patcher = unittest.mock.patch('database.load_neos', wraps=load_neos)
+        self.load_neos = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load_or_build(self, neo_file=None):
+        return NEODatabase.load_or_build(
+            neo_file or self.neo_file, self.cad_file, self.cache_file)
+
+    def age_cache(self, seconds):
+        """Shift the cache's mtime relative to the newest dependency."""
+        newest = max(os.stat(path).st_mtime for path in (
+            self.neo_file, self.cad_file, *database._PROJECT_ROOT.glob('*.py')))
+        os.utime(self.cache_file, (newest + seconds, newest + seconds))
+
+    def test_build_writes_cache(self):
+        db = self.load_or_build()
+        self.assertEqual(self.load_neos.call_count, 1)
+        self.assertTrue(self.cache_file.exists())
+        self.assertFalse(self.cache_file.with_name('neos.cache.partial').exists())
+        self.assertIsNotNone(db.get_neo_by_name('Lemmon'))
+
+    def test_fresh_cache_is_loaded(self):
+        self.load_or_build()
+        self.age_cache(10)
+        db = self.load_or_build()
+        self.assertEqual(self.load_neos.call_count, 1)
+
+        lemmon = db.get_neo_by_name('Lemmon')
+        self.assertIsNotNone(lemmon)
+        self.assertEqual(lemmon.designation, '2013 TL117')
+        for approach in lemmon.approaches:
+            self.assertIs(approach.neo, lemmon)
+
+    def test_stale_cache_is_rebuilt(self):
+        self.load_or_build()
+        self.age_cache(-10)
+        self.load_or_build()
+        self.assertEqual(self.load_neos.call_count, 2)
+
+    def test_cache_of_other_data_files_is_rebuilt(self):
+        self.load_or_build()
+        other_neo_file = self.root / 'other-neos.csv'
+        shutil.copy(self.neo_file, other_neo_file)
+        self.age_cache(10)
+        self.load_or_build(other_neo_file)
+        self.assertEqual(self.load_neos.call_count, 2)
+
+    def test_unwritable_cache_still_builds(self):
+        self.cache_file = self.root / 'missing' / 'neos.cache'
+        db = self.load_or_build()
+        self.assertEqual(self.load_neos.call_count, 1)
+        self.assertFalse(self.cache_file.exists())
+        self.assertIsNotNone(db.get_neo_by_name('Lemmon'))
+
+    def test_loading_cache_preserves_disabled_gc(self):
+        self.load_or_build()
+        self.age_cache(10)
+        gc.disable()
+        try:
+            self.load_or_build()
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+        self.assertEqual(self.load_neos.call_count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
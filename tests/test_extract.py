@@ -78,6 +78,17 @@ class TestLoadNEOs(unittest.TestCase):
         self.assertEqual(neo.hazardous, True)
 
 
+class TestNearEarthObjectHazardous(unittest.TestCase):
+    def test_hazardous_from_pha_field(self):
+        for pha, hazardous in (('Y', True), ('N', False), ('', False),
+                               (None, False), (True, True), (False, False)):
+            with self.subTest(pha=pha):
+                self.assertIs(NearEarthObject('X', pha=pha).hazardous, hazardous)
+
+    def test_hazardous_defaults_to_false(self):
+        self.assertIs(NearEarthObject('X').hazardous, False)
+
+
 class TestLoadApproaches(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -13,12 +13,13 @@ To run these tests from the project root, run::
 These tests should pass when Tasks 3a and 3b are complete.
 """
 import datetime
+import operator
 import pathlib
 import unittest
 
 from database import NEODatabase
 from extract import load_neos, load_approaches
-from filters import create_filters
+from filters import approach_date, compile_predicate, create_filters, get_distance
 
 
 TESTS_ROOT = (pathlib.Path(__file__).parent).resolve()
@@ -529,5 +530,71 @@ class TestQuery(unittest.TestCase):
         self.assertEqual(expected, received, msg="Computed results do not match expected results.")
 
 
+class TestCompilePredicate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.neos = load_neos(TEST_NEO_FILE)
+        cls.approaches = load_approaches(TEST_CAD_FILE)
+        cls.db = NEODatabase(cls.neos, cls.approaches)
+
+    def test_empty_criteria_match_everything(self):
+        predicate = compile_predicate([])
+        self.assertTrue(all(map(predicate, self.approaches)))
+
+    def test_known_getters_and_ops_are_inlined(self):
+        filters = create_filters(distance_max=0.1, velocity_min=10, hazardous=False)
+        predicate = compile_predicate(filters)
+
+        namespace = predicate.__globals__
+        self.assertFalse(any(name.startswith(('_get', '_op')) for name in namespace))
+
+        expected = set(
+            approach for approach in self.approaches
+            if approach.distance <= 0.1 and approach.velocity >= 10
+            and not approach.neo.hazardous
+        )
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(expected, set(filter(predicate, self.approaches)))
+
+    def test_date_values_are_bound_in_namespace(self):
+        date = datetime.date(2020, 3, 2)
+        predicate = compile_predicate([(approach_date, operator.eq, date)])
+        self.assertIs(predicate.__globals__['_value0'], date)
+
+        expected = set(
+            approach for approach in self.approaches
+            if approach.time.date() == date
+        )
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(expected, set(filter(predicate, self.approaches)))
+
+    def test_unknown_getters_and_ops_are_called(self):
+        def get_name(approach):
+            return approach.neo.name or ''
+
+        def startswith(value, prefix):
+            return value.startswith(prefix)
+
+        filters = [(get_name, startswith, 'A'), (get_distance, operator.lt, 0.2)]
+        predicate = compile_predicate(filters)
+
+        namespace = predicate.__globals__
+        self.assertIs(namespace['_get0'], get_name)
+        self.assertIs(namespace['_op0'], startswith)
+        self.assertNotIn('_get1', namespace)
+        self.assertNotIn('_op1', namespace)
+
+        expected = set(
+            approach for approach in self.approaches
+            if (approach.neo.name or '').startswith('A') and approach.distance < 0.2
+        )
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(expected, set(filter(predicate, self.approaches)))
+
+        # The database falls back to the predicate for criteria without a column.
+        self.assertEqual(expected, set(self.db.query(filters)))
+        self.assertEqual(expected, set(self.db.query(predicate)))
+
+
 if __name__ == '__main__':
     unittest.main()
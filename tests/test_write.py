@@ -21,12 +21,14 @@ import datetime
 import io
 import json
 import pathlib
+import threading
 import unittest
 import unittest.mock
 
 
 from extract import load_neos, load_approaches
 from database import NEODatabase
+from models import NearEarthObject, CloseApproach
 from write import write_to_csv, write_to_json
 
 
@@ -65,6 +67,15 @@ def UncloseableStringIO(value=''):
     buf.close()
 
 
+def write_to_string(write, results, **kwargs):
+    """Return what `write` writes to its file, given the `results`."""
+    with unittest.mock.patch('write.open') as mock_file:
+        with UncloseableStringIO() as buf:
+            mock_file.return_value = buf
+            write(results, None, **kwargs)
+            return buf.getvalue()
+
+
 class TestWriteToCSV(unittest.TestCase):
     @classmethod
     @unittest.mock.patch('write.open')
@@ -132,6 +143,48 @@ class TestWriteToCSV(unittest.TestCase):
         self.assertSetEqual(set(fieldnames), set(rows[0].keys()))
 
 
+class TestWriteToCSVQuoting(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        names = ('Comma, Name', 'Quoted "Name"', 'Multiline\nName', 'Plain')
+        neos = [NearEarthObject(f'2020 X{idx}', name, '1.5', 'Y')
+                for idx, name in enumerate(names)]
+        neos.append(NearEarthObject('2020 XA'))
+        cls.approaches = [
+            CloseApproach(neo.designation, '2020-Jan-01 00:00', '0.1', '2.5')
+            for neo in neos]
+        NEODatabase(neos, cls.approaches)
+
+        cls.value = write_to_string(write_to_csv, cls.approaches)
+
+    def test_csv_fields_needing_quotes_round_trip(self):
+        rows = tuple(csv.DictReader(io.StringIO(self.value, newline='')))
+        self.assertEqual(len(rows), len(self.approaches))
+
+        for row, approach in zip(rows, self.approaches):
+            neo = approach.neo
+            self.assertEqual(row, {
+                'datetime_utc': '2020-01-01 00:00',
+                'distance_au': '0.1',
+                'velocity_km_s': '2.5',
+                'designation': neo.designation,
+                'name': neo.name or '',
+                'diameter_km': str(neo.diameter),
+                'potentially_hazardous': str(neo.hazardous),
+            })
+
+    def test_csv_output_matches_csv_writer(self):
+        expected = io.StringIO()
+        writer = csv.writer(expected)
+        writer.writerow(('datetime_utc', 'distance_au', 'velocity_km_s', 'designation',
+                         'name', 'diameter_km', 'potentially_hazardous'))
+        for approach in self.approaches:
+            neo = approach.neo
+            writer.writerow((approach.time_str, approach.distance, approach.velocity,
+                             neo.designation, neo.name or '', neo.diameter, neo.hazardous))
+        self.assertEqual(self.value, expected.getvalue())
+
+
 class TestWriteToJSON(unittest.TestCase):
     @classmethod
     @unittest.mock.patch('write.open')
@@ -226,5 +279,101 @@ class TestWriteToJSON(unittest.TestCase):
         self.assertIsInstance(approach['neo']['potentially_hazardous'], bool)
 
 
+class TestWriteToJSONLayout(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Enough results to span several chunks of output.
+        cls.results = build_results(5) * 500
+
+    @staticmethod
+    def records(results):
+        return [{
+            "datetime_utc": approach.time_str,
+            "distance_au": approach.distance,
+            "velocity_km_s": approach.velocity,
+            "neo": {
+                "designation": approach.neo.designation,
+                "name": approach.neo.name or '',
+                "diameter_km": approach.neo.diameter,
+                "potentially_hazardous": approach.neo.hazardous,
+            },
+        } for approach in results]
+
+    def test_pretty_json_matches_indented_dump(self):
+        value = write_to_string(write_to_json, self.results, pretty=True)
+        self.assertEqual(value, json.dumps(self.records(self.results), indent='\t'))
+
+    def test_pretty_json_of_no_results(self):
+        value = write_to_string(write_to_json, (), pretty=True)
+        self.assertEqual(value, json.dumps([], indent='\t'))
+
+    def test_compact_json_matches_compact_dump(self):
+        value = write_to_string(write_to_json, self.results)
+        self.assertEqual(value, json.dumps(self.records(self.results), separators=(',', ':')))
+
+    def test_compact_json_of_no_results(self):
+        value = write_to_string(write_to_json, ())
+        self.assertEqual(value, json.dumps([], separators=(',', ':')))
+
+
+class FailingStringIO(io.StringIO):
+    """An `io.StringIO` whose writes fail once it holds `limit` characters.
+
+    Like `UncloseableStringIO`, closing it is a no-op, so that its contents can
+    still be read afterwards.
+    """
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, s):
+        if self.tell() >= self.limit:
+            raise OSError("No space left on device")
+        return super().write(s)
+
+    def close(self):
+        pass
+
+
+class TestWriteErrors(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Enough results to fill the writer thread's queue many times over.
+        cls.results = build_results(5) * 10000
+
+    def setUp(self):
+        self.threads = threading.active_count()
+
+    def tearDown(self):
+        self.assertEqual(threading.active_count(), self.threads)
+
+    @unittest.mock.patch('write.open')
+    def test_writer_error_is_reraised(self, mock_file):
+        for write in (write_to_csv, write_to_json):
+            with self.subTest(write=write.__name__):
+                buf = FailingStringIO(limit=100)
+                mock_file.return_value = buf
+                with self.assertRaises(OSError):
+                    write(self.results, None)
+                # The chunks written before the failure remain.
+                self.assertGreater(len(buf.getvalue()), 0)
+
+    @unittest.mock.patch('write.open')
+    def test_producer_error_is_reraised(self, mock_file):
+        def failing_results():
+            yield from self.results[:3000]
+            raise ValueError("Broken stream of results")
+
+        for write in (write_to_csv, write_to_json):
+            with self.subTest(write=write.__name__):
+                with UncloseableStringIO() as buf:
+                    mock_file.return_value = buf
+                    with self.assertRaises(ValueError):
+                        write(failing_results(), None)
+                    # The chunks completed before the failure remain.
+                    self.assertGreater(len(buf.getvalue()), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
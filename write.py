@@ -10,7 +10,240 @@ extension determines which of these functions is used.
 
 """
 import csv
+import io
 import json
+import queue
+import threading
+from itertools import islice
+
+# Output files are written through a 1 MiB buffer, to make fewer, larger
+# write calls than the default buffer size allows.
+_BUFFER_SIZE = 1 << 20
+
+# Rows are serialized in chunks of this many, and at most this many chunks are
+# queued up for the writer thread at a time.
+_CHUNK_ROWS = 1024
+_QUEUED_CHUNKS = 8
+
+# The records are freshly built trees of plain values, so the encoders can skip
+# tracking the containers they visit to detect reference cycles. Only compact
+# output is produced by the C-accelerated encoder, which `indent` rules out.
+_JSON_ENCODER = json.JSONEncoder(indent='\t', check_circular=False)
+_COMPACT_JSON_ENCODER = json.JSONEncoder(
+    separators=(',', ':'), check_circular=False)
+
+
+def _csv_row(approach):
+    """Return the CSV row of a `CloseApproach`, in the order of the fieldnames.
+
+    The items of interest are read straight off the approach and its NEO.
+    """
+
+    neo = approach.neo
+    return (approach.time_str, approach.distance, approach.velocity,
+            neo.designation, neo.name or '', neo.diameter, neo.hazardous)
+
+
+def _json_approach(approach):
+    """Return the JSON record of a `CloseApproach`, but for its NEO."""
+
+    return {
+        "datetime_utc": approach.time_str,
+        "distance_au": approach.distance,
+        "velocity_km_s": approach.velocity,
+    }
+
+
+def _csv_neo_fields(neo):
+    """Return the trailing, NEO-specific fields of a CSV line, joined."""
+
+    return (f'{neo.designation},{neo.name or ""},'
+            f'{neo.diameter!r},{neo.hazardous}')
+
+
+def _neo_record(neo):
+    """Return the JSON record of a `NearEarthObject`."""
+
+    return {
+        "designation": neo.designation,
+        "name": neo.name or '',
+        "diameter_km": neo.diameter,
+        "potentially_hazardous": neo.hazardous
+    }
+
+
+def _json_neo(neo):
+    """Return the encoded, indented JSON object of a `NearEarthObject`.
+
+    It's indented to sit one level deep, as the value of a record's 'neo' key.
+    """
+
+    return _JSON_ENCODER.encode(_neo_record(neo)).replace('\n', '\n\t')
+
+
+def _compact_json_neo(neo):
+    """Return the encoded, compact JSON object of a `NearEarthObject`."""
+
+    return _COMPACT_JSON_ENCODER.encode(_neo_record(neo))
+
+
+class _PerNEO(dict):
+    """A cache of the serialized fields of each NEO, filled on first lookup.
+
+    The same NEO generally recurs across many of the results, so its part of
+    a row is only formatted once per output file. The NEOs themselves are the
+    keys - they hash by identity, and keeping them alive means that their
+    entries can never be mistaken for those of another NEO.
+    """
+
+    def __init__(self, serialize):
+        super().__init__()
+        self._serialize = serialize
+
+    def __missing__(self, neo):
+        value = self[neo] = self._serialize(neo)
+        return value
+
+
+def _batches(results):
+    """Split a stream of close approaches into lists of up to `_CHUNK_ROWS`."""
+
+    results = iter(results)
+    while True:
+        batch = list(islice(results, _CHUNK_ROWS))
+        if not batch:
+            return
+        yield batch
+
+
+def _csv_lines(batch, neo_fields):
+    """Format a batch of close approaches as CSV lines, without the csv module.
+
+    `neo_fields` is a `_PerNEO` cache of `_csv_neo_fields`.
+
+    Return None if any field turns out to need quoting - that is, if the text
+    has more delimiters, quote characters or line breaks than the rows alone
+    account for - so that the caller can fall back to a `csv.writer`.
+    """
+
+    text = '\r\n'.join([
+        f'{approach.time_str},{approach.distance!r},{approach.velocity!r},'
+        f'{neo_fields[approach.neo]}'
+        for approach in batch]) + '\r\n'
+
+    rows = len(batch)
+    if ('"' in text or text.count(',') != 6 * rows
+            or text.count('\n') != rows or text.count('\r') != rows):
+        return None
+    return text
+
+
+def _csv_chunks(results, fieldnames):
+    """Serialize a stream of close approaches to CSV, in chunks of rows.
+
+    The first chunk starts with the header row. Designations and names hardly
+    ever need quoting, so each chunk is formatted directly, and only chunks
+    that do need quoting are written through a `csv.writer`.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    neo_fields = _PerNEO(_csv_neo_fields)
+
+    for batch in _batches(results):
+        lines = _csv_lines(batch, neo_fields)
+        if lines is None:
+            writer.writerows(map(_csv_row, batch))
+        else:
+            buffer.write(lines)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # only the header is left over when there were no results at all
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _json_chunks(results, pretty):
+    """Serialize a stream of close approaches to a JSON array, in chunks.
+
+    If `pretty`, each record is indented one level, exactly as if the whole
+    list had been encoded with `indent='\\t'` at once. Otherwise, the array is
+    encoded compactly, with no whitespace at all. Either way, the encoded NEO
+    is spliced in place of the closing brace of the rest of the record.
+    """
+
+    if pretty:
+        encode = _JSON_ENCODER.encode
+        neo_json = _PerNEO(_json_neo)
+
+        def encode_record(approach):
+            return (encode(_json_approach(approach))[:-2]
+                    + ',\n\t"neo": ' + neo_json[approach.neo] + '\n}'
+                    ).replace('\n', '\n\t')
+
+        opening, separator, closing = '[\n\t', ',\n\t', '\n]'
+    else:
+        encode = _COMPACT_JSON_ENCODER.encode
+        neo_json = _PerNEO(_compact_json_neo)
+
+        def encode_record(approach):
+            return (encode(_json_approach(approach))[:-1]
+                    + ',"neo":' + neo_json[approach.neo] + '}')
+
+        opening, separator, closing = '[', ',', ']'
+
+    empty = True
+    for batch in _batches(results):
+        yield ((opening if empty else separator)
+               + separator.join(map(encode_record, batch)))
+        empty = False
+
+    yield '[]' if empty else closing
+
+
+def _write_chunks(out_stream, chunks):
+    """Write a stream of strings to a file from a separate writer thread.
+
+    The calling thread goes on serializing the next chunk while the writer
+    thread writes the previous one - the GIL is released during the actual
+    write, so the two overlap. An error raised by a write, or by producing the
+    chunks, is re-raised here once the writer thread has stopped - whatever was
+    written up to that point remains in the file.
+
+    :param out_stream: A file-like object opened for writing text.
+    :param chunks: An iterable of strings to write, in order.
+    """
+
+    pending = queue.Queue(maxsize=_QUEUED_CHUNKS)
+    failures = []
+
+    def drain():
+        """Write the queued chunks until the `None` sentinel is received."""
+        try:
+            for chunk in iter(pending.get, None):
+                out_stream.write(chunk)
+        except BaseException as err:
+            failures.append(err)
+            # keep emptying the queue, so that the producer never blocks
+            for _ in iter(pending.get, None):
+                pass
+
+    writer = threading.Thread(target=drain, daemon=True)
+    writer.start()
+    try:
+        for chunk in chunks:
+            if failures:
+                break
+            pending.put(chunk)
+    finally:
+        pending.put(None)
+        writer.join()
+
+    if failures:
+        raise failures[0]
 
 
 def write_to_csv(results, filename):
@@ -40,24 +273,12 @@ def write_to_csv(results, filename):
         'diameter_km',
         'potentially_hazardous')
 
-    with open(filename, "w") as out_stream:
-        writer = csv.DictWriter(out_stream, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for result in results:
+    # newline='' lets the csv module control line endings, as it requires.
+    with open(filename, "w", buffering=_BUFFER_SIZE, newline='') as out_stream:
+        _write_chunks(out_stream, _csv_chunks(results, fieldnames))
 
-            # get a dictionary of items of interests for every object
-            approach_summary = list(result)[0]
-            neo_summary = list(result)[1]
 
-            # merge the two dictionaries
-            approach_summary.update(neo_summary)
-            # OR: approach_summary = dict(approach_summary, **neo_summary)
-
-            writer.writerow(approach_summary)
-
-
-def write_to_json(results, filename):
+def write_to_json(results, filename, pretty=False):
     """Write an iterable of `CloseApproach` objects to a JSON file.
 
     The precise output specification is in README.md. Roughly, the output is a
@@ -65,25 +286,18 @@ def write_to_json(results, filename):
     their values and the 'neo' key mapping to a dictionary of the associated
     NEO's attributes.
 
+    The output is compact, unless `pretty` is true - then it is indented with
+    tabs, for people to read, at the cost of more bytes and a slower encoder.
+
     :param results: 
         An iterable of `CloseApproach` objects.
     :param filename: 
         A Path-like object pointing to where the data should be saved.
+    :param pretty:
+        Whether to indent the output.
     """
 
-    json_data_list = []
-
-    for result in results:
-
-        # get a dictionary of items of interests for every object
-        approach_summary = list(result)[0]
-        neo_summary = list(result)[1]
-
-        json_data = approach_summary
-        # create a new key for neo and update it with the required summary
-        json_data['neo'] = neo_summary
-
-        json_data_list.append(json_data)
-
-    with open(filename, 'w') as out_stream:
-        json.dump(json_data_list, out_stream, indent='\t')
+    # stream the array a chunk of records at a time, so that memory use
+    # doesn't grow with the number of results
+    with open(filename, 'w', buffering=_BUFFER_SIZE) as out_stream:
+        _write_chunks(out_stream, _json_chunks(results, pretty))